@@ -75,6 +75,7 @@ def lambda_handler(event, context):
 
         knn_query = {
             "size": 5,
+            "_source": ["summary"],
             "query": {
                 "knn": {
                     "embedding": {
@@ -85,7 +86,7 @@ def lambda_handler(event, context):
             }
         }
 
-        url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_search"
+        url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_search?filter_path=hits.hits._score,hits.hits._source"
         signed = sign_request("POST", url, json.dumps(knn_query))
         response = http.request(
             "POST",
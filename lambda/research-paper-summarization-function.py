@@ -1,25 +1,24 @@
 import os
 import json
 import uuid
+import hashlib
 from io import BytesIO
 import boto3
-import botocore.auth
-import botocore.awsrequest
-import urllib3
 
 s3 = boto3.client("s3")
 ses = boto3.client("ses", region_name="us-east-1")
 dynamodb = boto3.resource("dynamodb")
 bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
+polly = boto3.client("polly", region_name="us-east-1")
 table = dynamodb.Table("ResearchSummaries")
 
 MAX_CHARS_PER_CHUNK = 3000
 BEDROCK_MODEL_ID = "mistral.mistral-7b-instruct-v0:2"
-EMBED_MODEL_ID = "amazon.titan-embed-text-v2:0"
 REGION = "us-east-1"
-OPENSEARCH_HOST = "https://search-vector-search-ysdsxdpfgxvffpewxvmjc3odya.us-east-1.es.amazonaws.com"
-INDEX_NAME = "research-papers"
-http = urllib3.PoolManager()
+PRECOMPUTE_AUDIO = os.environ.get("PRECOMPUTE_AUDIO", "false").lower() == "true"
+AUDIO_BUCKET = os.environ.get("AUDIO_BUCKET")
+AUDIO_PREFIX = "audio/"
+VOICE_ID = "Joanna"
 
 def send_email(to_address, summary, s3_key):
     subject = "Your Research Summary"
@@ -91,52 +90,44 @@ def summarize_text(text):
         print("Single chunk summary completed.")
         return summaries[0]
 
-def get_embedding(text):
-    payload = {"inputText": text}
-    print("Getting embedding from Bedrock (Titan)...")
-    response = bedrock.invoke_model(
-        modelId=EMBED_MODEL_ID,
-        contentType="application/json",
-        accept="application/json",
-        body=json.dumps(payload)
-    )
-    return json.loads(response['body'].read())['embedding']
-
-def sign_opensearch_request(method, url, body, service='es'):
-    credentials = boto3.Session().get_credentials().get_frozen_credentials()
-    request = botocore.awsrequest.AWSRequest(
-        method=method,
-        url=url,
-        data=body,
-        headers={"Host": OPENSEARCH_HOST.replace("https://", ""), "Content-Type": "application/json"}
-    )
-    signer = botocore.auth.SigV4Auth(credentials, service, REGION)
-    signer.add_auth(request)
-    return request
-
-def index_to_opensearch(paper_id, summary, s3_key, embedding):
-    document = {
-        "paper_id": paper_id,
-        "summary": summary,
-        "s3_url": f"https://{s3_key}",
-        "embedding": embedding
-    }
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_doc/{paper_id}"
-    print("Indexing into OpenSearch...")
-    body = json.dumps(document).encode("utf-8")
-    signed_request = sign_opensearch_request("PUT", url, body)
-    response = http.request("PUT", url, body=body, headers=dict(signed_request.headers))
-    print(f"OpenSearch status: {response.status}, message: {response.data.decode()}")
-
-def store_summary_in_dynamodb(summary, bucket, key):
+def hash_summary(summary):
+    return hashlib.sha256(summary.encode("utf-8")).hexdigest()
+
+def start_audio_synthesis(summary, summary_hash, bucket):
+    # Polly writes the MP3 to <prefix><TaskId>.mp3 once the task finishes,
+    # so the key is known up front and can be stored next to the summary.
+    audio_bucket = AUDIO_BUCKET or bucket
+    prefix = f"{AUDIO_PREFIX}{summary_hash}."
+    print(f"Starting Polly synthesis task into s3://{audio_bucket}/{prefix}...")
+    try:
+        response = polly.start_speech_synthesis_task(
+            Text=summary,
+            OutputFormat="mp3",
+            VoiceId=VOICE_ID,
+            Engine="neural",
+            OutputS3BucketName=audio_bucket,
+            OutputS3KeyPrefix=prefix
+        )
+        task_id = response["SynthesisTask"]["TaskId"]
+        print(f"Polly task started. Task ID: {task_id}")
+        return {"audio_bucket": audio_bucket, "audio_key": f"{prefix}{task_id}.mp3"}
+    except Exception as e:
+        # Audio is an optimisation; text-to-audio falls back to live synthesis.
+        print(f"Failed to start Polly task: {str(e)}")
+        return {}
+
+def store_summary_in_dynamodb(summary, bucket, key, summary_hash, audio=None):
     print("Storing summary in DynamoDB...")
     doc_id = str(uuid.uuid4())
+    item = {
+        "id": doc_id,
+        "s3_key": f"{bucket}/{key}",
+        "s": summary,
+        "summary_hash": summary_hash
+    }
+    item.update(audio or {})
     try:
-        table.put_item(Item={
-            "id": doc_id,
-            "s3_key": f"{bucket}/{key}",
-            "s": summary
-        })
+        table.put_item(Item=item)
         print(f"Summary stored successfully. ID: {doc_id}")
         return doc_id
     except Exception as e:
@@ -164,11 +155,10 @@ def lambda_handler(event, context):
         text = obj["Body"].read().decode("utf-8")
 
         summary = summarize_text(text)
-        doc_id = store_summary_in_dynamodb(summary, bucket, key)
+        summary_hash = hash_summary(summary)
+        audio = start_audio_synthesis(summary, summary_hash, bucket) if PRECOMPUTE_AUDIO else {}
+        store_summary_in_dynamodb(summary, bucket, key, summary_hash, audio)
 
-        embedding = get_embedding(summary)
-        index_to_opensearch(doc_id, summary, f"{bucket}.s3.amazonaws.com/{key}", embedding)
-        print(f"Embedding preview: {embedding[:5]}... (length: {len(embedding)})")
         send_email(email, summary, f"{bucket}/{key}")
         print("Email sent via SES.")
 
@@ -1,5 +1,8 @@
 import os
 import json
+import time
+import math
+from collections import OrderedDict, deque
 import boto3
 import botocore.auth
 import botocore.awsrequest
@@ -9,11 +12,28 @@ REGION = "us-east-1"
 EMBED_MODEL_ID = "amazon.titan-embed-text-v2:0"
 OPENSEARCH_HOST = "https://search-vector-search-ysdsxdpfgxvffpewxvmjc3odya.us-east-1.es.amazonaws.com"
 INDEX_NAME = "research-papers"
+META_INDEX_NAME = "research-papers-meta"
+INDEX_VERSION_DOC_ID = "index_version"
 MIN_SCORE = 0.75
+DEFAULT_K = 5
+MAX_K = 100
+CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "512"))
+INDEX_VERSION_TTL_SECONDS = float(os.environ.get("INDEX_VERSION_TTL_SECONDS", "30"))
 
 bedrock = boto3.client("bedrock-runtime", region_name=REGION)
 http = urllib3.PoolManager()
 
+# Per-container state, reused across warm invocations. Cached result sets are
+# tagged with the index version they were computed against; the version is
+# re-read from OpenSearch at most every INDEX_VERSION_TTL_SECONDS, so repeat
+# searches in between are served without any network calls.
+result_cache = OrderedDict()
+index_version = {"value": None, "checked_at": float("-inf")}
+# Returned when the version read fails. It never equals a cached tag and is
+# never stored, so those requests bypass the cache instead of trusting it.
+VERSION_UNAVAILABLE = object()
+stats = {"requests": 0, "hits": 0, "latencies_ms": deque(maxlen=1000)}
+
 def get_embedding(text):
     payload = {"inputText": text}
     response = bedrock.invoke_model(
@@ -39,6 +59,98 @@ def sign_request(method, url, body, service="es"):
     signer.add_auth(request)
     return request
 
+def opensearch_request(method, path, body):
+    url = f"{OPENSEARCH_HOST}/{path}"
+    signed = sign_request(method, url, body)
+    response = http.request(method, url, body=body, headers=dict(signed.headers))
+    return response.status, json.loads(response.data.decode())
+
+def current_index_version():
+    now = time.monotonic()
+    if now - index_version["checked_at"] >= INDEX_VERSION_TTL_SECONDS:
+        try:
+            status, doc = opensearch_request(
+                "GET", f"{META_INDEX_NAME}/_doc/{INDEX_VERSION_DOC_ID}?filter_path=found,_source.version", None
+            )
+        except Exception as e:
+            print(f"Failed to read index version: {str(e)}")
+            return VERSION_UNAVAILABLE
+        if status == 200:
+            version = doc.get("_source", {}).get("version")
+        elif status == 404 and doc.get("found") is False:
+            # The meta index exists but nothing has been indexed yet.
+            version = None
+        else:
+            print(f"Failed to read index version: status {status}")
+            return VERSION_UNAVAILABLE
+        if version != index_version["value"]:
+            result_cache.clear()
+        index_version["value"] = version
+        index_version["checked_at"] = now
+    return index_version["value"]
+
+def parse_search_params(body):
+    k = body.get("k", DEFAULT_K)
+    if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_K:
+        raise ValueError(f"'k' must be an integer between 1 and {MAX_K}")
+    filters = body.get("filters") or {}
+    if not isinstance(filters, dict) or not all(
+        isinstance(value, (str, int, float, bool)) for value in filters.values()
+    ):
+        raise ValueError("'filters' must be an object of field names to scalar values")
+    return k, filters
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+def cache_key(query, k, filters):
+    return (query, k, json.dumps(filters, sort_keys=True))
+
+def build_knn_query(query_embedding, k, filters):
+    knn = {"vector": query_embedding, "k": k}
+    if filters:
+        knn["filter"] = {"bool": {"filter": [{"term": {field: value}} for field, value in filters.items()]}}
+    return {
+        "size": k,
+        "_source": ["paper_id", "summary", "s3_url"],
+        "query": {"knn": {"embedding": knn}}
+    }
+
+def search(query, k, filters):
+    query_embedding = get_embedding(query)
+    knn_query = json.dumps(build_knn_query(query_embedding, k, filters)).encode()
+    status, search_response = opensearch_request(
+        "POST", f"{INDEX_NAME}/_search?filter_path=hits.hits._score,hits.hits._source", knn_query
+    )
+    # Raise rather than return an empty list so a throttled or failed search
+    # is never cached as a real result set.
+    if not 200 <= status < 300:
+        raise Exception(f"OpenSearch search failed with status {status}")
+    hits = search_response.get("hits", {}).get("hits", [])
+    return [
+        {
+            "paper_id": h["_source"].get("paper_id"),
+            "summary": h["_source"].get("summary"),
+            "s3_url": h["_source"].get("s3_url")
+        }
+        for h in hits if h.get("_score", 0) >= MIN_SCORE
+    ]
+
+def record_request(cache_hit, started):
+    latency_ms = (time.monotonic() - started) * 1000
+    stats["requests"] += 1
+    stats["hits"] += int(cache_hit)
+    stats["latencies_ms"].append(latency_ms)
+    latencies = sorted(stats["latencies_ms"])
+    p95 = latencies[math.ceil(0.95 * len(latencies)) - 1]
+    print(json.dumps({
+        "metric": "search",
+        "cache_hit": cache_hit,
+        "latency_ms": round(latency_ms, 2),
+        "cache_hit_rate": round(stats["hits"] / stats["requests"], 4),
+        "p95_latency_ms": round(p95, 2)
+    }))
+
 def lambda_handler(event, context):
     print(f"Lambda Event: {event}")
     if event.get("httpMethod") == "OPTIONS":
@@ -67,37 +179,38 @@ def lambda_handler(event, context):
                 "body": json.dumps({"error": "Missing 'query'"})
             }
 
-        print(f"Embedding query: {query}")
-        query_embedding = get_embedding(query)
-        print(f"Query embedding: {query_embedding}")
-
-        knn_query = {
-            "size": 5,
-            "query": {
-                "knn": {
-                    "embedding": {
-                        "vector": query_embedding,
-                        "k": 5
-                    }
-                }
+        try:
+            k, filters = parse_search_params(body)
+        except ValueError as e:
+            return {
+                "statusCode": 400,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Methods": "POST, OPTIONS",
+                    "Access-Control-Allow-Headers": "Content-Type"
+                },
+                "body": json.dumps({"error": str(e)})
             }
-        }
-
-        url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_search"
-        signed = sign_request("POST", url, json.dumps(knn_query))
-        response = http.request("POST", url, body=json.dumps(knn_query).encode(), headers=dict(signed.headers))
 
-        search_response = json.loads(response.data.decode())
-        hits = search_response.get("hits", {}).get("hits", [])
-
-        filtered = [
-            {
-                "paper_id": h["_source"].get("paper_id"),
-                "summary": h["_source"].get("summary"),
-                "s3_url": h["_source"].get("s3_url")
-            }
-            for h in hits if h.get("_score", 0) >= MIN_SCORE
-        ]
+        # Embed the normalized text too, so a cached result set depends only
+        # on its key and not on which spelling of the query arrived first.
+        query = normalize_query(query)
+        started = time.monotonic()
+        version = current_index_version()
+        key = cache_key(query, k, filters)
+        cached = result_cache.get(key)
+        if cached and version is not VERSION_UNAVAILABLE and cached[0] == version:
+            result_cache.move_to_end(key)
+            filtered = cached[1]
+            record_request(True, started)
+        else:
+            print(f"Searching for: {query}")
+            filtered = search(query, k, filters)
+            if version is not VERSION_UNAVAILABLE:
+                result_cache[key] = (version, filtered)
+                if len(result_cache) > CACHE_MAX_ENTRIES:
+                    result_cache.popitem(last=False)
+            record_request(False, started)
 
         return {
             "statusCode": 200,
@@ -0,0 +1,229 @@
+import os
+import json
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+import botocore.auth
+import botocore.awsrequest
+from botocore.config import Config
+from boto3.dynamodb.types import TypeDeserializer
+import urllib3
+
+REGION = "us-east-1"
+EMBED_MODEL_ID = "amazon.titan-embed-text-v2:0"
+OPENSEARCH_HOST = "https://search-vector-search-ysdsxdpfgxvffpewxvmjc3odya.us-east-1.es.amazonaws.com"
+INDEX_NAME = "research-papers"
+# search-papers polls this document to invalidate its cached result sets.
+META_INDEX_NAME = "research-papers-meta"
+INDEX_VERSION_DOC_ID = "index_version"
+TABLE_NAME = "ResearchSummaries"
+BULK_BATCH_SIZE = 100
+EMBED_WORKERS = int(os.environ.get("EMBED_WORKERS", "16"))
+SCAN_SEGMENTS = int(os.environ.get("SCAN_SEGMENTS", "8"))
+
+# Low-level clients are thread-safe, unlike boto3 resources, so the parallel
+# scan and the embedding pool share them. Every segment thread submits to the
+# one embedding pool, so Bedrock concurrency stays at EMBED_WORKERS and the
+# connection pools are sized to match.
+dynamodb = boto3.client("dynamodb", region_name=REGION, config=Config(max_pool_connections=SCAN_SEGMENTS))
+bedrock = boto3.client("bedrock-runtime", region_name=REGION, config=Config(max_pool_connections=EMBED_WORKERS))
+http = urllib3.PoolManager(maxsize=SCAN_SEGMENTS)
+embed_pool = ThreadPoolExecutor(max_workers=EMBED_WORKERS)
+deserializer = TypeDeserializer()
+
+def get_embedding(text):
+    response = bedrock.invoke_model(
+        modelId=EMBED_MODEL_ID,
+        contentType="application/json",
+        accept="application/json",
+        body=json.dumps({"inputText": text})
+    )
+    return json.loads(response['body'].read())['embedding']
+
+def sign_request(method, url, body, service="es"):
+    credentials = boto3.Session().get_credentials().get_frozen_credentials()
+    request = botocore.awsrequest.AWSRequest(
+        method=method,
+        url=url,
+        data=body,
+        headers={
+            "Host": OPENSEARCH_HOST.replace("https://", ""),
+            "Content-Type": "application/json"
+        }
+    )
+    signer = botocore.auth.SigV4Auth(credentials, service, REGION)
+    signer.add_auth(request)
+    return request
+
+def opensearch_request(method, path, body):
+    url = f"{OPENSEARCH_HOST}/{path}"
+    signed = sign_request(method, url, body)
+    response = http.request(method, url, body=body, headers=dict(signed.headers))
+    return response.status, json.loads(response.data.decode())
+
+def deserialize(image):
+    return {k: deserializer.deserialize(v) for k, v in image.items()}
+
+def summary_hash_of(item):
+    return item.get("summary_hash") or hashlib.sha256(item.get("s", "").encode("utf-8")).hexdigest()
+
+def to_document(item, embedding):
+    bucket, _, key = item.get("s3_key", "").partition("/")
+    return {
+        "paper_id": item["id"],
+        "summary": item.get("s", ""),
+        "s3_url": f"https://{bucket}.s3.amazonaws.com/{key}",
+        "summary_hash": summary_hash_of(item),
+        "embedding": embedding
+    }
+
+def embed_items(items):
+    embeddings = list(embed_pool.map(lambda item: get_embedding(item.get("s", "")), items))
+    return [to_document(item, embedding) for item, embedding in zip(items, embeddings)]
+
+def bulk_write(documents, deleted_ids=()):
+    """Send index/delete actions in one _bulk call per batch; return ids that failed."""
+    actions = []
+    for doc in documents:
+        actions.append(json.dumps({"index": {"_index": INDEX_NAME, "_id": doc["paper_id"]}}))
+        actions.append(json.dumps(doc))
+    for paper_id in deleted_ids:
+        actions.append(json.dumps({"delete": {"_index": INDEX_NAME, "_id": paper_id}}))
+    if not actions:
+        return []
+
+    body = ("\n".join(actions) + "\n").encode("utf-8")
+    status, result = opensearch_request("POST", "_bulk?filter_path=errors,items.*._id,items.*.status", body)
+    print(f"OpenSearch bulk status: {status}, actions: {len(documents) + len(deleted_ids)}")
+    if status >= 300:
+        return [doc["paper_id"] for doc in documents] + list(deleted_ids)
+    if not result.get("errors"):
+        return []
+    failed = []
+    for entry in result.get("items", []):
+        op = next(iter(entry.values()))
+        # A delete of a document that was never indexed is not a failure.
+        if op.get("status", 500) >= 300 and op.get("status") != 404:
+            failed.append(op.get("_id"))
+    return failed
+
+def bump_index_version():
+    body = json.dumps({"version": time.time_ns()}).encode("utf-8")
+    status, _ = opensearch_request("PUT", f"{META_INDEX_NAME}/_doc/{INDEX_VERSION_DOC_ID}", body)
+    print(f"Index version bumped, status: {status}")
+
+def fetch_indexed_hashes(paper_ids):
+    if not paper_ids:
+        return {}
+    body = json.dumps({"ids": paper_ids}).encode("utf-8")
+    status, result = opensearch_request(
+        "POST",
+        f"{INDEX_NAME}/_mget?_source=summary_hash&filter_path=docs._id,docs._source",
+        body
+    )
+    if status >= 300:
+        print(f"OpenSearch _mget failed with status {status}; re-embedding whole page")
+        return {}
+    return {d["_id"]: d.get("_source", {}).get("summary_hash") for d in result.get("docs", [])}
+
+def sync_items(items):
+    """Re-embed and index only the items whose summary hash differs from the index."""
+    indexed = fetch_indexed_hashes([item["id"] for item in items])
+    changed = [item for item in items if indexed.get(item["id"]) != summary_hash_of(item)]
+    failed = []
+    for i in range(0, len(changed), BULK_BATCH_SIZE):
+        failed += bulk_write(embed_items(changed[i:i + BULK_BATCH_SIZE]))
+    return len(changed), failed
+
+def scan_segment(segment, total_segments):
+    paginator = dynamodb.get_paginator("scan")
+    scanned, indexed, failed = 0, 0, []
+    for page in paginator.paginate(
+        TableName=TABLE_NAME,
+        Segment=segment,
+        TotalSegments=total_segments,
+        PaginationConfig={"PageSize": BULK_BATCH_SIZE}
+    ):
+        items = [deserialize(raw) for raw in page.get("Items", [])]
+        scanned += len(items)
+        changed, page_failed = sync_items(items)
+        indexed += changed
+        failed += page_failed
+    print(f"Segment {segment}/{total_segments}: scanned {scanned}, re-indexed {indexed}, failed {len(failed)}")
+    return scanned, indexed, failed
+
+def reindex(event):
+    total_segments = int(event.get("totalSegments", SCAN_SEGMENTS))
+    # A single segment lets a caller fan the reindex out across invocations.
+    if "segment" in event:
+        segments = [int(event["segment"])]
+    else:
+        segments = list(range(total_segments))
+
+    with ThreadPoolExecutor(max_workers=min(len(segments), SCAN_SEGMENTS)) as pool:
+        results = list(pool.map(lambda seg: scan_segment(seg, total_segments), segments))
+
+    summary = {
+        "scanned": sum(r[0] for r in results),
+        "reindexed": sum(r[1] for r in results),
+        "failed": [paper_id for r in results for paper_id in r[2]]
+    }
+    print(f"Reindex complete: {json.dumps(summary)}")
+    if summary["reindexed"]:
+        bump_index_version()
+    return {"statusCode": 200 if not summary["failed"] else 207, "body": json.dumps(summary)}
+
+def process_stream(records):
+    # Coalesce to the latest image per paper so a burst of writes to the same
+    # item costs one embedding and one bulk action.
+    # The change is judged from the image before the batch's first record
+    # (none for an INSERT) to the latest one, so a later write that leaves
+    # the summary alone cannot hide an earlier change in the same batch.
+    latest = {}
+    first_sequence = {}
+    first_old_image = {}
+    for record in records:
+        paper_id = deserializer.deserialize(record["dynamodb"]["Keys"]["id"])
+        latest[paper_id] = record
+        if paper_id not in first_sequence:
+            first_sequence[paper_id] = record["dynamodb"]["SequenceNumber"]
+            first_old_image[paper_id] = record["dynamodb"].get("OldImage")
+
+    upserts, deletes = [], []
+    for paper_id, record in latest.items():
+        if record["eventName"] == "REMOVE":
+            deletes.append(paper_id)
+            continue
+        new_item = deserialize(record["dynamodb"]["NewImage"])
+        old_image = first_old_image[paper_id]
+        if old_image and summary_hash_of(deserialize(old_image)) == summary_hash_of(new_item):
+            print(f"Skipping {paper_id}: summary unchanged")
+            continue
+        upserts.append(new_item)
+
+    print(f"Stream batch: {len(records)} records, {len(upserts)} upserts, {len(deletes)} deletes")
+    failed = []
+    for i in range(0, len(upserts), BULK_BATCH_SIZE):
+        failed += bulk_write(embed_items(upserts[i:i + BULK_BATCH_SIZE]))
+    failed += bulk_write([], deletes)
+    if upserts or deletes:
+        bump_index_version()
+
+    # Retry from the earliest failed record; index/delete by id is idempotent.
+    if failed:
+        # An id missing from the batch (e.g. None from a malformed bulk item)
+        # falls back to retrying the whole batch.
+        retry_from = min(
+            (first_sequence[p] for p in failed if p in first_sequence),
+            key=int,
+            default=records[0]["dynamodb"]["SequenceNumber"]
+        )
+        print(f"{len(failed)} papers failed to index; retrying from sequence {retry_from}")
+        return {"batchItemFailures": [{"itemIdentifier": retry_from}]}
+    return {"batchItemFailures": []}
+
+def lambda_handler(event, context):
+    if event.get("action") == "reindex":
+        return reindex(event)
+    return process_stream(event.get("Records", []))
@@ -1,8 +1,42 @@
 import json
 import boto3
 import base64
+from botocore.exceptions import ClientError
 
 polly = boto3.client('polly')
+s3 = boto3.client('s3')
+dynamodb = boto3.resource('dynamodb')
+table = dynamodb.Table('ResearchSummaries')
+
+def synthesize(text):
+    max_length = 3000
+    text_chunks = [text[i:i+max_length] for i in range(0, len(text), max_length)]
+
+    audio_chunks = []
+    for chunk in text_chunks:
+        response = polly.synthesize_speech(
+            Text=chunk,
+            OutputFormat='mp3',
+            VoiceId='Joanna',
+            Engine='neural'
+        )
+        audio_chunks.append(response['AudioStream'].read())
+
+    return b''.join(audio_chunks)
+
+def fetch_precomputed_audio(item):
+    bucket = item.get('audio_bucket')
+    key = item.get('audio_key')
+    if not bucket or not key:
+        return None
+    try:
+        obj = s3.get_object(Bucket=bucket, Key=key)
+        print(f"Serving precomputed audio from s3://{bucket}/{key}")
+        return obj['Body'].read()
+    except ClientError as e:
+        # NoSuchKey while the Polly task is still running, or if it failed.
+        print(f"Precomputed audio miss for s3://{bucket}/{key}: {str(e)}")
+        return None
 
 def lambda_handler(event, context):
 
@@ -23,31 +57,32 @@ def lambda_handler(event, context):
         }
 
     try:
-        text = ""
-        if 'queryStringParameters' in event and event['queryStringParameters']:
-            text = event['queryStringParameters'].get('text', '')
-        
-        if not text:
-            return {
-                "statusCode": 400,
-                "headers": headers,
-                "body": json.dumps({"error": "Missing 'text' parameter"})
-            }
+        params = event.get('queryStringParameters') or {}
+        paper_id = params.get('paperId', '')
+        text = params.get('text', '')
+
+        combined_audio = None
+        if paper_id:
+            item = table.get_item(Key={'id': paper_id}).get('Item')
+            if not item:
+                return {
+                    "statusCode": 404,
+                    "headers": headers,
+                    "body": json.dumps({"error": f"Paper '{paper_id}' not found"})
+                }
+            combined_audio = fetch_precomputed_audio(item)
+            text = item.get('s', '')
 
-        max_length = 3000
-        text_chunks = [text[i:i+max_length] for i in range(0, len(text), max_length)]
-        
-        audio_chunks = []
-        for chunk in text_chunks:
-            response = polly.synthesize_speech(
-                Text=chunk,
-                OutputFormat='mp3',
-                VoiceId='Joanna',
-                Engine='neural' 
-            )
-            audio_chunks.append(response['AudioStream'].read())
+        if combined_audio is None:
+            if not text:
+                return {
+                    "statusCode": 400,
+                    "headers": headers,
+                    "body": json.dumps({"error": "Missing 'paperId' or 'text' parameter"})
+                }
+            print("Falling back to live Polly synthesis")
+            combined_audio = synthesize(text)
 
-        combined_audio = b''.join(audio_chunks)
         encoded_audio = base64.b64encode(combined_audio).decode('utf-8')
 
         return {
@@ -63,4 +98,4 @@ def lambda_handler(event, context):
             "statusCode": 500,
             "headers": headers,
             "body": json.dumps({"error": str(e)})
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,686 @@
+"""Concurrent load test for the upload-to-search pipeline.
+
+Loads the Lambda handlers from ../lambda and drives mixed traffic through
+them, with in-memory stand-ins for S3, SQS, DynamoDB (plus its stream),
+Bedrock, Polly, SES and OpenSearch. Each stand-in sleeps for a configurable
+service latency. That lets the handlers' own concurrency and batching
+behaviour show up in the numbers without touching AWS.
+
+Traffic:
+  - PDF uploads through uploadpaperstos3 at --upload-rate per second
+  - SQS consumers (--summarizers) feeding research-paper-summarization-function
+  - a stream poller feeding sync-summaries-to-opensearch
+  - interleaved search-papers, QAchatbot and text-to-audio calls at --read-rate
+
+Reported: per-handler latency percentiles, SQS and stream backlog over time,
+and end-to-end time from upload until the paper is (a) accepted by the index
+and (b) first returned by search-papers. For (b) every upload starts a probe
+that repeats one search for that paper every --probe-interval seconds, so
+search-papers' result cache and its index-version poll are included.
+Pass --sweep-summarizers 1,2,4,8 to repeat the run at several consumer
+concurrencies and find where end-to-end latency stops improving.
+
+Usage:
+  python loadtest/pipeline_load_test.py --uploads 40 --latency-scale 0.1
+"""
+import os
+import io
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import base64
+import hashlib
+import argparse
+import threading
+import contextlib
+import importlib.util
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lambda")
+BUCKET = "loadtest-papers"
+QUEUE_URL = "https://sqs.us-east-1.amazonaws.com/000000000000/loadtest-papers"
+EMBED_DIM = 64
+
+# Seconds per call, multiplied by --latency-scale.
+SERVICE_LATENCY = {
+    "s3": 0.02,
+    "sqs": 0.01,
+    "dynamodb": 0.01,
+    "ses": 0.05,
+    "llm": 0.8,
+    "embedding": 0.1,
+    "polly": 0.3,
+    "polly_start": 0.05,
+    "polly_task": 2.0,
+    "opensearch": 0.03,
+}
+
+TOPICS = {
+    "vision": "convolutional image segmentation detection pixels backbone augmentation resnet features",
+    "language": "transformer attention tokens language pretraining decoder corpus embeddings translation",
+    "systems": "distributed latency throughput cluster scheduling replication storage consensus cache",
+    "biology": "protein genome sequencing cells expression folding molecular mutation pathway",
+}
+
+
+class Clock:
+    def __init__(self, scale):
+        self.scale = scale
+
+    def sleep(self, service):
+        time.sleep(SERVICE_LATENCY[service] * self.scale)
+
+
+def embed_text(text):
+    """Bag-of-words hashing embedding so related texts score as similar."""
+    vector = [0.0] * EMBED_DIM
+    for word in text.lower().split():
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % EMBED_DIM] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def client_error(code):
+    from botocore.exceptions import ClientError
+    return ClientError({"Error": {"Code": code, "Message": code}}, "GetObject")
+
+
+class FakeS3:
+    def __init__(self, clock):
+        self.clock = clock
+        self.objects = {}
+        self.lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.clock.sleep("s3")
+        with self.lock:
+            self.objects[(Bucket, Key)] = Body if isinstance(Body, bytes) else Body.encode()
+        return {}
+
+    def get_object(self, Bucket, Key):
+        self.clock.sleep("s3")
+        with self.lock:
+            data = self.objects.get((Bucket, Key))
+        if data is None:
+            raise client_error("NoSuchKey")
+        return {"Body": io.BytesIO(data)}
+
+
+class FakeSQS:
+    def __init__(self, clock):
+        self.clock = clock
+        self.messages = deque()
+        self.lock = threading.Lock()
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.clock.sleep("sqs")
+        with self.lock:
+            self.messages.append(MessageBody)
+        return {"MessageId": str(uuid.uuid4())}
+
+    def receive(self, max_messages):
+        with self.lock:
+            batch = []
+            while self.messages and len(batch) < max_messages:
+                batch.append(self.messages.popleft())
+        return batch
+
+    def depth(self):
+        with self.lock:
+            return len(self.messages)
+
+
+class FakeTable:
+    """ResearchSummaries with a NEW_AND_OLD_IMAGES change stream."""
+
+    def __init__(self, clock):
+        from boto3.dynamodb.types import TypeSerializer
+        self.clock = clock
+        self.items = {}
+        self.stream = deque()
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.serializer = TypeSerializer()
+
+    def _image(self, item):
+        return {k: self.serializer.serialize(v) for k, v in item.items()}
+
+    def put_item(self, Item):
+        self.clock.sleep("dynamodb")
+        with self.lock:
+            old = self.items.get(Item["id"])
+            self.items[Item["id"]] = dict(Item)
+            self.sequence += 1
+            record = {
+                "eventName": "MODIFY" if old else "INSERT",
+                "dynamodb": {
+                    "Keys": {"id": {"S": Item["id"]}},
+                    "NewImage": self._image(Item),
+                    "SequenceNumber": str(self.sequence),
+                },
+            }
+            if old:
+                record["dynamodb"]["OldImage"] = self._image(old)
+            self.stream.append(record)
+        return {}
+
+    def get_item(self, Key):
+        self.clock.sleep("dynamodb")
+        with self.lock:
+            item = self.items.get(Key["id"])
+        return {"Item": dict(item)} if item else {}
+
+    def scan(self, **kwargs):
+        self.clock.sleep("dynamodb")
+        with self.lock:
+            return {"Items": [dict(i) for i in self.items.values()]}
+
+    def read_stream(self, max_records):
+        with self.lock:
+            batch = []
+            while self.stream and len(batch) < max_records:
+                batch.append(self.stream.popleft())
+        return batch
+
+    def stream_depth(self):
+        with self.lock:
+            return len(self.stream)
+
+    def ids(self):
+        with self.lock:
+            return list(self.items)
+
+
+class FakeBedrock:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def invoke_model(self, modelId, body, **kwargs):
+        payload = json.loads(body)
+        if "titan-embed" in modelId:
+            self.clock.sleep("embedding")
+            result = {"embedding": embed_text(payload["inputText"])}
+        else:
+            self.clock.sleep("llm")
+            prompt = payload["prompt"].replace("[/INST]", "").split(":", 1)[-1]
+            result = {"outputs": [{"text": " ".join(prompt.split()[:80])}]}
+        return {"body": io.BytesIO(json.dumps(result).encode())}
+
+
+class FakePolly:
+    def __init__(self, clock, s3):
+        self.clock = clock
+        self.s3 = s3
+
+    def synthesize_speech(self, Text, **kwargs):
+        self.clock.sleep("polly")
+        return {"AudioStream": io.BytesIO(b"ID3" + Text.encode()[:256])}
+
+    def start_speech_synthesis_task(self, Text, OutputS3BucketName, OutputS3KeyPrefix, **kwargs):
+        self.clock.sleep("polly_start")
+        task_id = str(uuid.uuid4())
+        key = f"{OutputS3KeyPrefix}{task_id}.mp3"
+        timer = threading.Timer(
+            SERVICE_LATENCY["polly_task"] * self.clock.scale,
+            self.s3.put_object,
+            kwargs={"Bucket": OutputS3BucketName, "Key": key, "Body": b"ID3" + Text.encode()[:256]},
+        )
+        timer.daemon = True
+        timer.start()
+        return {"SynthesisTask": {"TaskId": task_id}}
+
+
+class FakeSES:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def send_email(self, **kwargs):
+        self.clock.sleep("ses")
+        return {"MessageId": str(uuid.uuid4())}
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self.data = json.dumps(payload).encode()
+
+
+class FakeOpenSearch:
+    """Just enough of the OpenSearch REST API for the handlers in ../lambda."""
+
+    def __init__(self, clock, on_indexed):
+        self.clock = clock
+        self.on_indexed = on_indexed
+        self.indices = defaultdict(dict)
+        self.lock = threading.Lock()
+
+    def request(self, method, url, body=None, headers=None):
+        self.clock.sleep("opensearch")
+        parsed = urlparse(url)
+        parts = [p for p in parsed.path.split("/") if p]
+        body = body.decode() if isinstance(body, bytes) else body
+        if parts == ["_bulk"]:
+            return self._bulk(body)
+        index, op = parts[0], parts[1]
+        if op == "_search":
+            return self._search(index, json.loads(body))
+        if op == "_mget":
+            return self._mget(index, json.loads(body), parse_qs(parsed.query))
+        if op == "_doc":
+            doc_id = parts[2]
+            with self.lock:
+                if method == "PUT":
+                    self.indices[index][doc_id] = json.loads(body)
+                    return FakeResponse(200, {"result": "updated"})
+                doc = self.indices[index].get(doc_id)
+            if doc is None:
+                return FakeResponse(404, {"found": False})
+            return FakeResponse(200, {"_id": doc_id, "_source": doc})
+        return FakeResponse(400, {"error": f"unsupported path {parsed.path}"})
+
+    def _bulk(self, body):
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        items, indexed = [], []
+        i = 0
+        with self.lock:
+            while i < len(lines):
+                action, meta = next(iter(lines[i].items()))
+                if action == "index":
+                    self.indices[meta["_index"]][meta["_id"]] = lines[i + 1]
+                    indexed.append(lines[i + 1])
+                    i += 2
+                    status = 201
+                else:
+                    status = 200 if self.indices[meta["_index"]].pop(meta["_id"], None) else 404
+                    i += 1
+                items.append({action: {"_id": meta["_id"], "status": status}})
+        for doc in indexed:
+            self.on_indexed(doc)
+        return FakeResponse(200, {"errors": False, "items": items})
+
+    def _mget(self, index, body, query):
+        with self.lock:
+            docs = self.indices[index]
+            found = [
+                {"_id": i, "_source": {"summary_hash": docs[i].get("summary_hash")}}
+                for i in body["ids"] if i in docs
+            ]
+        return FakeResponse(200, {"docs": found})
+
+    def _search(self, index, body):
+        knn = body["query"]["knn"]["embedding"]
+        vector = knn["vector"]
+        with self.lock:
+            docs = list(self.indices[index].values())
+        scored = []
+        for doc in docs:
+            cosine = sum(a * b for a, b in zip(vector, doc["embedding"]))
+            scored.append(((1 + cosine) / 2, doc))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        fields = body.get("_source")
+        hits = [
+            {"_score": score, "_source": {k: v for k, v in doc.items() if not fields or k in fields}}
+            for score, doc in scored[:knn["k"]]
+        ]
+        return FakeResponse(200, {"hits": {"hits": hits}})
+
+
+def load_handler(file_name):
+    path = os.path.join(LAMBDA_DIR, file_name)
+    name = file_name.replace("-", "_").replace(".py", "")
+    spec = importlib.util.spec_from_file_location(f"loadtest_{name}_{uuid.uuid4().hex}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_pdf(text):
+    """Build a minimal single-font PDF whose text PyPDF2 can extract."""
+    lines = [text[i:i + 90] for i in range(0, len(text), 90)]
+    escaped = [l.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for l in lines]
+    content = "BT /F1 10 Tf 12 TL 40 780 Td " + " ".join(f"({l}) Tj T*" for l in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def paper_text(rng, chars):
+    topic = rng.choice(list(TOPICS))
+    vocabulary = TOPICS[topic].split() + "the a of we show results method model data".split()
+    sentences = []
+    while sum(len(s) + 1 for s in sentences) < chars:
+        sentences.append(" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 16))).capitalize() + ".")
+    return topic, " ".join(sentences)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.backlog = []
+        self.uploaded_at = {}
+        self.indexed_at = {}
+        self.searchable_at = {}
+
+    def record(self, handler, seconds, failed):
+        with self.lock:
+            self.latencies[handler].append(seconds * 1000)
+            if failed:
+                self.errors[handler] += 1
+
+    def on_indexed(self, doc):
+        key = doc["s3_url"].rsplit("/", 1)[-1]
+        now = time.monotonic()
+        with self.lock:
+            if key in self.uploaded_at:
+                self.indexed_at.setdefault(key, now)
+
+    def on_searchable(self, key, now):
+        with self.lock:
+            self.searchable_at.setdefault(key, now)
+
+    def end_to_end(self, reached_at):
+        with self.lock:
+            return [(reached_at[k] - self.uploaded_at[k]) * 1000 for k in reached_at]
+
+
+class Pipeline:
+    def __init__(self, args):
+        self.args = args
+        self.clock = Clock(args.latency_scale)
+        self.metrics = Metrics()
+        self.s3 = FakeS3(self.clock)
+        self.sqs = FakeSQS(self.clock)
+        self.table = FakeTable(self.clock)
+        self.opensearch = FakeOpenSearch(self.clock, self.metrics.on_indexed)
+        fakes = {
+            "s3": self.s3,
+            "sqs": self.sqs,
+            "table": self.table,
+            "bedrock": FakeBedrock(self.clock),
+            "polly": FakePolly(self.clock, self.s3),
+            "ses": FakeSES(self.clock),
+            "http": self.opensearch,
+        }
+        self.handlers = {}
+        for name in ("uploadpaperstos3", "research-paper-summarization-function",
+                     "sync-summaries-to-opensearch", "search-papers", "QAchatbot", "text-to-audio"):
+            module = load_handler(f"{name}.py")
+            for attr, fake in fakes.items():
+                if hasattr(module, attr):
+                    setattr(module, attr, fake)
+            self.handlers[name] = module.lambda_handler
+        self.probe_pool = ThreadPoolExecutor(max_workers=max(1, args.uploads))
+        self.uploads_done = threading.Event()
+        self.summaries_done = threading.Event()
+        self.stop = threading.Event()
+
+    def invoke(self, name, event, label=None):
+        started = time.monotonic()
+        failed = True
+        try:
+            response = self.handlers[name](event, None) or {}
+            failed = response.get("statusCode", 200) >= 500 or bool(response.get("batchItemFailures"))
+            return response
+        finally:
+            self.metrics.record(label or name, time.monotonic() - started, failed)
+
+    def upload(self, rng):
+        topic, text = paper_text(rng, self.args.paper_chars)
+        body = {
+            "fileName": f"{topic}-{uuid.uuid4().hex[:8]}.pdf",
+            "contentType": "application/pdf",
+            "base64Data": base64.b64encode(make_pdf(text)).decode(),
+            "email": "loadtest@example.com",
+        }
+        started = time.monotonic()
+        response = self.invoke("uploadpaperstos3", {"httpMethod": "POST", "body": json.dumps(body)})
+        if response.get("statusCode") == 200:
+            key = json.loads(response["body"])["fileName"]
+            with self.metrics.lock:
+                self.metrics.uploaded_at[key] = started
+            # The stand-in LLM's summary starts with the paper's opening words,
+            # so this query ranks the paper first once it is visible.
+            self.probe_pool.submit(self.probe, key, " ".join(text.split()[:80]))
+
+    def probe(self, key, query):
+        deadline = time.monotonic() + self.args.probe_timeout
+        event = {"httpMethod": "POST", "body": json.dumps({"query": query})}
+        while time.monotonic() < deadline:
+            response = self.invoke("search-papers", event, label="search-papers (probe)")
+            if response.get("statusCode") == 200:
+                results = json.loads(response["body"])["results"]
+                if any((r.get("s3_url") or "").endswith(f"/{key}") for r in results):
+                    self.metrics.on_searchable(key, time.monotonic())
+                    return
+            time.sleep(self.args.probe_interval)
+
+    def read(self, rng):
+        op = rng.choices(["search", "qa", "audio"], weights=self.args.mix)[0]
+        topic_words = TOPICS[rng.choice(list(TOPICS))].split()
+        query = " ".join(rng.sample(topic_words, 3))
+        if op == "search":
+            self.invoke("search-papers", {"httpMethod": "POST", "body": json.dumps({"query": query})})
+        elif op == "qa":
+            self.invoke("QAchatbot", {"httpMethod": "POST", "body": json.dumps({"query": f"What is new in {query}?"})})
+        else:
+            ids = self.table.ids()
+            params = {"paperId": rng.choice(ids)} if ids else {"text": query}
+            self.invoke("text-to-audio", {"httpMethod": "GET", "queryStringParameters": params})
+
+    def summarizer(self):
+        # The handler reads Records[0] only, so each received message is its
+        # own invocation, as with an event source mapping of BatchSize=1.
+        while True:
+            batch = self.sqs.receive(self.args.sqs_batch_size)
+            if not batch:
+                if self.uploads_done.is_set():
+                    return
+                time.sleep(0.01)
+                continue
+            for message in batch:
+                self.invoke("research-paper-summarization-function", {"Records": [{"body": message}]})
+
+    def stream_poller(self):
+        while True:
+            records = self.table.read_stream(self.args.stream_batch_size)
+            if records:
+                self.invoke("sync-summaries-to-opensearch", {"Records": records})
+            elif self.summaries_done.is_set():
+                return
+            else:
+                time.sleep(self.args.stream_window)
+
+    def sampler(self, started):
+        while not self.stop.is_set():
+            self.metrics.backlog.append((time.monotonic() - started, self.sqs.depth(), self.table.stream_depth()))
+            time.sleep(0.1)
+
+    def paced(self, pool, rate, count, action, seed):
+        rng = random.Random(seed)
+        futures = []
+        next_at = time.monotonic()
+        for _ in range(count):
+            next_at += rng.expovariate(rate)
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(action, random.Random(rng.random())))
+        for future in futures:
+            future.result()
+
+    def run(self):
+        args = self.args
+        started = time.monotonic()
+        threading.Thread(target=self.sampler, args=(started,), daemon=True).start()
+        summarizers = [threading.Thread(target=self.summarizer) for _ in range(args.summarizers)]
+        poller = threading.Thread(target=self.stream_poller)
+        for t in summarizers + [poller]:
+            t.start()
+
+        reads = int(args.read_rate * args.uploads / args.upload_rate)
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            uploader = threading.Thread(target=self.paced, args=(pool, args.upload_rate, args.uploads, self.upload, 1))
+            reader = threading.Thread(target=self.paced, args=(pool, args.read_rate, reads, self.read, 2))
+            uploader.start()
+            reader.start()
+            uploader.join()
+            self.uploads_done.set()
+            reader.join()
+
+        for t in summarizers:
+            t.join()
+        self.summaries_done.set()
+        poller.join()
+        self.probe_pool.shutdown(wait=True)
+        self.stop.set()
+        return time.monotonic() - started
+
+    def report(self, elapsed):
+        m = self.metrics
+        indexed = m.end_to_end(m.indexed_at)
+        e2e = m.end_to_end(m.searchable_at)
+        handlers = {
+            name: {
+                "count": len(values),
+                "errors": m.errors[name],
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+            }
+            for name, values in sorted(m.latencies.items())
+        }
+        return {
+            "summarizers": self.args.summarizers,
+            "elapsed_s": round(elapsed, 2),
+            "papers_indexed": len(indexed),
+            "papers_searchable": len(e2e),
+            "throughput_papers_per_s": round(len(indexed) / elapsed, 2) if elapsed else 0.0,
+            "upload_to_indexed_ms": {
+                "p50": round(percentile(indexed, 50), 1),
+                "p95": round(percentile(indexed, 95), 1),
+                "max": round(max(indexed, default=0.0), 1),
+            },
+            "upload_to_searchable_ms": {
+                "p50": round(percentile(e2e, 50), 1),
+                "p95": round(percentile(e2e, 95), 1),
+                "max": round(max(e2e, default=0.0), 1),
+            },
+            "sqs_backlog": {
+                "max": max((b[1] for b in m.backlog), default=0),
+                "mean": round(sum(b[1] for b in m.backlog) / len(m.backlog), 1) if m.backlog else 0.0,
+            },
+            "stream_backlog_max": max((b[2] for b in m.backlog), default=0),
+            "handlers": handlers,
+        }
+
+
+def print_report(report):
+    print(f"\nsummarizers={report['summarizers']}  elapsed={report['elapsed_s']}s  "
+          f"indexed={report['papers_indexed']}  searchable={report['papers_searchable']}  "
+          f"throughput={report['throughput_papers_per_s']} papers/s")
+    indexed = report["upload_to_indexed_ms"]
+    print(f"upload->indexed ms: p50={indexed['p50']} p95={indexed['p95']} max={indexed['max']}")
+    e2e = report["upload_to_searchable_ms"]
+    print(f"upload->searchable ms: p50={e2e['p50']} p95={e2e['p95']} max={e2e['max']}")
+    print(f"SQS backlog: max={report['sqs_backlog']['max']} mean={report['sqs_backlog']['mean']}  "
+          f"stream backlog max={report['stream_backlog_max']}")
+    print(f"{'handler':40} {'count':>6} {'errors':>6} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9}")
+    for name, h in report["handlers"].items():
+        print(f"{name:40} {h['count']:>6} {h['errors']:>6} {h['p50_ms']:>9} {h['p95_ms']:>9} {h['p99_ms']:>9}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=40, help="number of PDFs to upload")
+    parser.add_argument("--upload-rate", type=float, default=4.0, help="uploads per second (Poisson arrivals)")
+    parser.add_argument("--read-rate", type=float, default=20.0, help="search/QA/audio calls per second")
+    parser.add_argument("--mix", default="0.6,0.2,0.2", help="search,qa,audio weights for read traffic")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client requests")
+    parser.add_argument("--summarizers", type=int, default=4, help="concurrent summarization consumers")
+    parser.add_argument("--sweep-summarizers", help="comma-separated consumer counts to run in turn")
+    parser.add_argument("--sqs-batch-size", type=int, default=10, help="messages per SQS receive")
+    parser.add_argument("--stream-batch-size", type=int, default=100, help="records per stream invocation")
+    parser.add_argument("--stream-window", type=float, default=0.5, help="seconds the stream poller waits when idle")
+    parser.add_argument("--probe-interval", type=float, default=0.5, help="seconds between searchability probes")
+    parser.add_argument("--probe-timeout", type=float, default=120.0, help="seconds a probe waits for its paper")
+    parser.add_argument("--index-version-ttl", type=float,
+                        help="INDEX_VERSION_TTL_SECONDS for search-papers (handler default 30)")
+    parser.add_argument("--paper-chars", type=int, default=8000, help="extracted text length per paper")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for stand-in service latencies")
+    parser.add_argument("--precompute-audio", action="store_true", help="set PRECOMPUTE_AUDIO for the summarizer")
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the handlers' own log output")
+    args = parser.parse_args(argv)
+    args.mix = [float(w) for w in args.mix.split(",")]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "loadtest")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "loadtest")
+    os.environ.update({
+        "S3_BUCKET_NAME": BUCKET,
+        "SQS_QUEUE_URL": QUEUE_URL,
+        "SES_VERIFIED_SENDER": "loadtest@example.com",
+        "PRECOMPUTE_AUDIO": "true" if args.precompute_audio else "false",
+    })
+    if args.index_version_ttl is not None:
+        os.environ["INDEX_VERSION_TTL_SECONDS"] = str(args.index_version_ttl)
+
+    counts = [int(c) for c in args.sweep_summarizers.split(",")] if args.sweep_summarizers else [args.summarizers]
+    reports = []
+    for count in counts:
+        args.summarizers = count
+        pipeline = Pipeline(args)
+        with open(os.devnull, "w") as devnull:
+            quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+            with quiet:
+                elapsed = pipeline.run()
+        report = pipeline.report(elapsed)
+        reports.append(report)
+        if not args.json:
+            print_report(report)
+
+    if args.json:
+        print(json.dumps(reports if len(reports) > 1 else reports[0], indent=2))
+    elif len(reports) > 1:
+        print("\nsummarizers  throughput  indexed_p95_ms  searchable_p95_ms  sqs_backlog_max")
+        for r in reports:
+            print(f"{r['summarizers']:>11}  {r['throughput_papers_per_s']:>10}  "
+                  f"{r['upload_to_indexed_ms']['p95']:>14}  {r['upload_to_searchable_ms']['p95']:>17}  "
+                  f"{r['sqs_backlog']['max']:>15}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
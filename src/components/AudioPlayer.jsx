@@ -2,7 +2,7 @@ import React, { useState } from 'react';
 import { Volume2, VolumeX, Loader2, Play, Pause } from 'lucide-react';
 import { TEXT_TO_SPEECH_API_ENDPOINT } from '../constants';
 
-export default function AudioPlayer({ text }) {
+export default function AudioPlayer({ text, paperId }) {
   const [isPlaying, setIsPlaying] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
   const [audioUrl, setAudioUrl] = useState(null);
@@ -27,7 +27,10 @@ export default function AudioPlayer({ text }) {
     setError(null);
     try {
       console.log('Fetching audio...');
-      const response = await fetch(`${TEXT_TO_SPEECH_API_ENDPOINT}?text=${encodeURIComponent(text)}`);
+      const query = paperId
+        ? `paperId=${encodeURIComponent(paperId)}`
+        : `text=${encodeURIComponent(text)}`;
+      const response = await fetch(`${TEXT_TO_SPEECH_API_ENDPOINT}?${query}`);
       console.log('Response status:', response.status);
       console.log('Response headers:', Object.fromEntries(response.headers.entries()));
       
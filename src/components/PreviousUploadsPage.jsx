@@ -94,7 +94,7 @@ export default function PreviousUploadsPage({ navigateTo }) {
                   {new Date(parseInt(paper.s3_key.split('-')[0])).toLocaleDateString()}
                 </span>
                 <div className="flex items-center gap-4">
-                  <AudioPlayer text={paper.s} />
+                  <AudioPlayer text={paper.s} paperId={paper.id} />
                   <button
                     onClick={() => navigateTo('qa', paper)}
                     className="bg-blue-500 text-white text-sm px-3 py-1 rounded-md hover:bg-blue-600 flex items-center gap-1"
@@ -42,6 +42,7 @@ export default function SummariesSection({ navigateTo }) {
         setStatus({ type: '', message: '' });
         setSummaries(
           (data.results || []).map(item => ({
+              id: item.paper_id,
               s3_key: item.s3_url,          
               s: item.summary                
           }))
@@ -106,7 +107,7 @@ export default function SummariesSection({ navigateTo }) {
                 <p>{item.s}</p>
               </div>
               <div className="flex justify-between items-center">
-                <AudioPlayer text={item.s} />
+                <AudioPlayer text={item.s} paperId={item.id} />
                 <button
                   onClick={() => navigateTo('qa', item)}
                   className="text-blue-500 hover:text-blue-700 text-sm flex items-center gap-1"